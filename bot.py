@@ -2,126 +2,459 @@ import discord
 import json
 import random
 import os
-import uuid
 import asyncio
+import gzip
+import hashlib
+import heapq
+import logging
+import mmap
+import pickle
+import time
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 from typing import Optional, List, Dict
 from discord import app_commands, ui
 from discord.ui import Modal, TextInput, View, Button, Select
 from discord.ext import commands
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
+log = logging.getLogger(__name__)
 TOKEN = os.getenv("TOKEN")
 WORDS_FILE = os.getenv("WORDS_FILE", "words.txt")
 MAX_ATTEMPTS = 6
 MAX_HINTS = 3  # Maximale Anzahl an Tipps
-DATA_FILE = "wordle_data.json"
+DATA_FILE = "wordle_data.json"  # Alte Gesamtdatei, wird beim ersten Start aufgeteilt
+COMPRESS_DATA = os.getenv("COMPRESS_DATA", "false").lower() == "true"  # Spielerhistorien als .gz speichern
 CONFIG_FILE = "server_config.json"
+RECENT_GAMES_MAX = 50  # Anzahl der global gemerkten letzten Spiele
+USERS_DIR = os.path.join("data", "users")
+AGGREGATES_FILE = os.path.join("data", "aggregates.json")
+MAX_HISTORY = int(os.getenv("MAX_HISTORY", "200"))  # Gespeicherte Spiele pro Spieler
+USER_CACHE_SIZE = 256  # Spielerhistorien, die gleichzeitig im Speicher bleiben
+SAVE_DELAY = 5.0  # Sekunden Ruhe nach einer Änderung bevor gespeichert wird
+SAVE_MAX_DELAY = 30.0  # Spätestens nach dieser Zeit wird trotz laufender Änderungen gespeichert
+DEV_GUILD_ID = os.getenv("WORDLE_DEV_GUILD_ID")  # Befehle nur auf diesem Server synchronisieren
 
+# Nur Slash-Befehle und Buttons: weder Nachrichteninhalte noch Mitgliederlisten nötig
 intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class WordleBot(commands.Bot):
+    async def setup_hook(self):
+        # Läuft genau einmal vor dem Verbinden, anders als on_ready
+        cog = WordleCog(self)
+        await self.add_cog(cog)
+        await cog.add_persistent_views()
+        await sync_commands(cog)
+
+bot = WordleBot(command_prefix="!", intents=intents, chunk_guilds_at_startup=False)
+
+def json_loads(raw: bytes):
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def json_dumps(obj) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+def read_json_file(path: str):
+    # Liefert None wenn die Datei fehlt; gzip wird an den Magic-Bytes erkannt
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    return json_loads(raw)
+
+def write_file(path: str, content: bytes):
+    # Erst vollständig in eine temporäre Datei schreiben, dann atomar ersetzen
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb", buffering=0) as f:
+        view = memoryview(content)
+        while view:
+            view = view[f.write(view):]
+    os.replace(tmp, path)
+
+def game_ts(game: dict) -> int:
+    # Ältere Einträge haben nur den ISO-Zeitstempel
+    ts = game.get("ts")
+    return ts if ts is not None else int(datetime.fromisoformat(game["timestamp"]).timestamp())
+
+@lru_cache(maxsize=4096)
+def _format_minutes(minutes: int, seconds: int) -> str:
+    return f"{minutes}m {seconds}s"
+
+def load_words(path: str) -> tuple:
+    # Gefilterte Liste neben der Datei zwischenspeichern, gültig solange sich mtime nicht ändert
+    # Eigener Dateiname pro Filter, die anderen Bot-Varianten filtern die Liste anders
+    cache_path = path + ".utf8.cache"
+    mtime = os.path.getmtime(path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_mtime, words = pickle.load(f)
+        if cached_mtime == mtime:
+            return words
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+    
+    # Nur Zeilen dekodieren, die 5 Zeichen haben können: genau 5 Bytes,
+    # oder bis 10 Bytes mit Umlauten (zwei Bytes pro Zeichen)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        candidates = (
+            w.decode("utf-8")
+            for w in map(bytes.strip, iter(mm.readline, b""))
+            if len(w) == 5 or (5 < len(w) <= 10 and not w.isascii())
+        )
+        words = tuple(w.lower() for w in candidates if len(w) == 5)
+    
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((mtime, words), f)
+    except OSError:
+        pass
+    return words
 
 class ServerConfig:
     def __init__(self):
-        self.config = self.load_config()
+        self.config = {}
+        self._channel_cache: Optional[Dict[int, int]] = None
+    
+    async def load_async(self):
+        self.config = await asyncio.to_thread(self.load_config)
+        self._channel_cache = None
     
     def load_config(self):
         try:
-            with open(CONFIG_FILE) as f:
-                return json.load(f)
+            with open(CONFIG_FILE, "rb") as f:
+                return json_loads(f.read())
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
-    def save_config(self):
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(self.config, f, indent=2)
+    def dump_config(self) -> bytes:
+        return json_dumps(self.config)
+    
+    def _write_blocking(self, payload: bytes):
+        write_file(CONFIG_FILE, payload)
+    
+    async def save_config_async(self):
+        # Serialisieren im Event-Loop, Schreiben im Thread
+        await asyncio.to_thread(self._write_blocking, self.dump_config())
     
     def set_wordle_channel(self, guild_id: int, channel_id: int):
         self.config[str(guild_id)] = channel_id
-        self.save_config()
+        self._channel_cache = None
     
     def get_wordle_channel(self, guild_id: int) -> Optional[int]:
         return self.config.get(str(guild_id))
+    
+    def get_all_wordle_channels(self) -> Dict[int, int]:
+        if self._channel_cache is None:
+            self._channel_cache = {
+                int(guild_id): channel_id for guild_id, channel_id in self.config.items() if guild_id.isdigit()
+            }
+        return self._channel_cache
+    
+    def set_tree_hash(self, tree_hash: str):
+        self.config["tree_hash"] = tree_hash
+    
+    def get_tree_hash(self) -> Optional[str]:
+        return self.config.get("tree_hash")
+    
+    def set_menu_message(self, guild_id: int, message_id: int):
+        self.config.setdefault("menu_messages", {})[str(guild_id)] = message_id
+    
+    def get_menu_message(self, guild_id: int) -> Optional[int]:
+        return self.config.get("menu_messages", {}).get(str(guild_id))
 
 class GameHistory:
     def __init__(self):
-        self.data = self.load_data()
+        # Laufende Summen pro Spieler und die letzten Spiele aller Spieler (neueste zuerst)
+        self.aggregates: Dict[str, dict] = {}
+        self.recent_games_deque = deque(maxlen=RECENT_GAMES_MAX)
+        # Geladene Spielerhistorien, zuletzt genutzte am Ende
+        self._user_cache: OrderedDict = OrderedDict()
+        self._dirty_users = set()
+        self._saving_users = set()  # gerade im Thread geschrieben, bei Fehler wieder dirty
+        self._aggregates_dirty = False
+        # Wird bei jedem neuen Spiel erhöht, damit zwischengespeicherte Ansichten verfallen
+        self.version = 0
+        self._next_id = 1
+    
+    async def load_async(self):
+        await asyncio.to_thread(self.load_data)
     
     def load_data(self):
+        os.makedirs(USERS_DIR, exist_ok=True)
         try:
-            with open(DATA_FILE) as f:
-                data = json.load(f)
+            data = read_json_file(AGGREGATES_FILE)
+        except json.JSONDecodeError:
+            data = {}
+        if data is None:
+            self.migrate_legacy_data()
+            return
+        self.aggregates = data.get("aggregates", {})
+        self.recent_games_deque = deque(data.get("recent", []), maxlen=RECENT_GAMES_MAX)
+        self._next_id = data.get("next_id") or self._count_games() + 1
+    
+    def migrate_legacy_data(self):
+        # Einmalig die alte Gesamtdatei in eine Datei pro Spieler aufteilen
+        users = self.load_legacy_data()["users"]
+        self.build_aggregates(users)
+        self._next_id = self._count_games() + 1
+        files = {self.user_path(user_id): json_dumps(games[:MAX_HISTORY]) for user_id, games in users.items()}
+        files[AGGREGATES_FILE] = self.dump_aggregates()
+        self._write_blocking(files)
+    
+    def load_legacy_data(self):
+        # Liegen beide Varianten vor, gilt die zuletzt geschriebene
+        paths = [path for path in (DATA_FILE + ".gz", DATA_FILE) if os.path.exists(path)]
+        for path in sorted(paths, key=os.path.getmtime, reverse=True):
+            try:
+                data = read_json_file(path)
+            except (OSError, EOFError, json.JSONDecodeError):
+                return {"users": {}}
+            if data is not None:
                 return data if "users" in data else {"users": {}}
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"users": {}}
+        return {"users": {}}
     
-    def save_data(self):
-        with open(DATA_FILE, "w") as f:
-            json.dump(self.data, f, indent=2)
+    def build_aggregates(self, users: Dict[str, List[dict]]):
+        self.aggregates = {}
+        for user_id, games in users.items():
+            agg = self.aggregates[user_id] = self.new_aggregate()
+            # Historie ist neueste zuerst, die Serie muss aber chronologisch gezählt werden
+            for game in reversed(games):
+                self.count_game(agg, game)
+        
+        recent = heapq.nlargest(
+            RECENT_GAMES_MAX,
+            ((g["timestamp"], int(user_id), g) for user_id, games in users.items() for g in games),
+            key=lambda t: t[0]
+        )
+        self.recent_games_deque = deque(
+            (dict(g, user_id=user_id) for _, user_id, g in recent),
+            maxlen=RECENT_GAMES_MAX
+        )
+    
+    def _count_games(self) -> int:
+        # Alte IDs sind zufällige UUID-Teile und taugen nicht als Startwert, daher ab der Anzahl weiterzählen
+        return sum(agg["total"] for agg in self.aggregates.values())
+    
+    @staticmethod
+    def new_aggregate() -> dict:
+        return {"wins": 0, "total": 0, "sum_attempts": 0, "sum_hints": 0, "sum_duration": 0.0, "current_streak": 0}
     
-    def add_game(self, user_id: int, game_data: dict):
+    @staticmethod
+    def count_game(agg: dict, game: dict):
+        agg["wins"] += game["won"]
+        agg["total"] += 1
+        agg["sum_attempts"] += len(game["guesses"])
+        agg["sum_hints"] += game["hints"]
+        agg["sum_duration"] += game["duration"]
+        agg["current_streak"] = agg["current_streak"] + 1 if game["won"] else 0
+    
+    def get_user_stats(self, user_id: int) -> dict:
         user_id = str(user_id)
-        if user_id not in self.data["users"]:
-            self.data["users"][user_id] = []
-            
+        agg = self.aggregates.get(user_id)
+        if agg is None:
+            return self.new_aggregate()
+        if "current_streak" not in agg:
+            # Summen aus älterer Datei: fehlende Felder einmalig aus der gespeicherten Historie ergänzen
+            games = self._get_games(user_id)
+            agg["sum_duration"] = sum(g["duration"] for g in games)
+            agg["current_streak"] = next((i for i, g in enumerate(games) if not g["won"]), len(games))
+            self._aggregates_dirty = True
+        return agg
+    
+    @staticmethod
+    def user_path(user_id: str) -> str:
+        return os.path.join(USERS_DIR, f"{user_id}.json" + (".gz" if COMPRESS_DATA else ""))
+    
+    @staticmethod
+    def other_user_path(path: str) -> str:
+        return path[:-3] if path.endswith(".gz") else path + ".gz"
+    
+    def _read_user_file(self, user_id: str) -> list:
+        # Aktuelles Format zuerst, die andere Variante stammt von vor einem Wechsel von COMPRESS_DATA
+        path = self.user_path(user_id)
+        for candidate in (path, self.other_user_path(path)):
+            try:
+                stored = read_json_file(candidate)
+            except (OSError, EOFError, json.JSONDecodeError):
+                stored = None
+            if stored is not None:
+                return stored
+        return []
+    
+    async def load_user_async(self, user_id: int):
+        # Historie im Thread lesen, damit spätere Zugriffe im Event-Loop aus dem Cache kommen
+        user_id = str(user_id)
+        if user_id in self._user_cache:
+            return
+        stored = await asyncio.to_thread(self._read_user_file, user_id)
+        if user_id not in self._user_cache:
+            self._cache_games(user_id, stored)
+    
+    def _get_games(self, user_id: str) -> deque:
+        games = self._user_cache.get(user_id)
+        if games is not None:
+            self._user_cache.move_to_end(user_id)
+            return games
+        return self._cache_games(user_id, self._read_user_file(user_id))
+    
+    def _cache_games(self, user_id: str, stored: list) -> deque:
+        games = self._user_cache[user_id] = deque(stored, maxlen=MAX_HISTORY)
+        
+        # Nur bereits gespeicherte Historien aus dem Speicher werfen
+        for cached_id in list(self._user_cache):
+            if len(self._user_cache) <= USER_CACHE_SIZE:
+                break
+            if cached_id == user_id:
+                continue
+            if cached_id not in self._dirty_users and cached_id not in self._saving_users:
+                del self._user_cache[cached_id]
+        return games
+    
+    def dump_aggregates(self) -> bytes:
+        return json_dumps({
+            "aggregates": self.aggregates,
+            "recent": list(self.recent_games_deque),
+            "next_id": self._next_id
+        })
+    
+    def dump_data(self) -> Dict[str, bytes]:
+        # Nur geänderte Spieler und die Summen-Datei schreiben
+        files = {self.user_path(user_id): json_dumps(list(self._user_cache[user_id])) for user_id in self._dirty_users}
+        if self._aggregates_dirty:
+            files[AGGREGATES_FILE] = self.dump_aggregates()
+        self._saving_users, self._dirty_users = self._dirty_users, set()
+        self._aggregates_dirty = False
+        return files
+    
+    def _finish_save(self, files: Dict[str, bytes], ok: bool):
+        if not ok:
+            # Nichts verlieren: beim nächsten Speichern erneut schreiben
+            self._dirty_users |= self._saving_users
+            self._aggregates_dirty |= AGGREGATES_FILE in files
+        self._saving_users = set()
+    
+    def _write_blocking(self, files: Dict[str, bytes]):
+        for path, payload in files.items():
+            if path.endswith(".gz"):
+                payload = gzip.compress(payload, compresslevel=1)
+            write_file(path, payload)
+            if os.path.dirname(path) == USERS_DIR:
+                # Veraltete Variante im anderen Format entfernen
+                try:
+                    os.remove(self.other_user_path(path))
+                except FileNotFoundError:
+                    pass
+    
+    async def save_data_async(self):
+        # Serialisieren im Event-Loop, Schreiben im Thread
+        files = self.dump_data()
+        ok = False
+        try:
+            await asyncio.to_thread(self._write_blocking, files)
+            ok = True
+        finally:
+            self._finish_save(files, ok)
+    
+    def add_game(self, user_id: int, game_data: dict, name: Optional[str] = None):
+        user_id = str(user_id)
+        now = datetime.now()
+        game_id = self._next_id
+        self._next_id += 1
         game_data.update({
-            "id": str(uuid.uuid4())[:8].upper(),
-            "timestamp": datetime.now().isoformat(),
+            "id": format(game_id, "08X"),
+            "timestamp": now.isoformat(),
+            "ts": int(now.timestamp()),
             "attempts": len(game_data["guesses"]),
             "hints": game_data["hints"],
             "guesses": [{"word": g[0], "result": g[1]} for g in game_data["guesses"]]
         })
         
-        self.data["users"][user_id].insert(0, game_data)
-        self.save_data()
+        # Fehlende Summen vor dem Einfügen ergänzen, sonst zählt das neue Spiel doppelt
+        self.get_user_stats(user_id)
+        self._get_games(user_id).appendleft(game_data)
+        self._dirty_users.add(user_id)
+        
+        agg = self.aggregates.setdefault(user_id, self.new_aggregate())
+        self.count_game(agg, game_data)
+        if name:
+            # Für die Rangliste, ohne dass der Spieler im Mitglieder-Cache sein muss
+            agg["name"] = name
+        self.recent_games_deque.appendleft(dict(game_data, user_id=int(user_id)))
+        self._aggregates_dirty = True
+        self.version += 1
     
-    def get_user_games(self, user_id: int) -> List[dict]:
-        return self.data["users"].get(str(user_id), [])
+    async def get_user_stats_async(self, user_id: int) -> dict:
+        agg = self.aggregates.get(str(user_id))
+        if agg is not None and "current_streak" not in agg:
+            await self.load_user_async(user_id)
+        return self.get_user_stats(user_id)
+    
+    def get_user_games(self, user_id: int) -> deque:
+        return self._get_games(str(user_id))
     
     def get_leaderboard(self) -> List[dict]:
         leaderboard = []
-        for user_id, games in self.data["users"].items():
-            wins = sum(1 for g in games if g["won"])
-            total = len(games)
+        for user_id, agg in self.aggregates.items():
+            wins = agg["wins"]
+            total = agg["total"]
             leaderboard.append({
                 "user_id": int(user_id),
                 "wins": wins,
                 "total": total,
                 "win_rate": wins/total if total > 0 else 0,
-                "avg_attempts": sum(len(g["guesses"]) for g in games)/total if total > 0 else 0
+                "avg_attempts": agg["sum_attempts"]/total if total > 0 else 0
             })
-        return sorted(leaderboard, key=lambda x: (-x["wins"], -x["win_rate"]))
+        leaderboard.sort(key=lambda x: (-x["wins"], -x["win_rate"]))
+        return leaderboard
 
 class WordleGame:
     def __init__(self, user_id: int):
         self.user_id = user_id
-        self.secret_word = random.choice(WORDS)
+        self.secret_word = WORDS[random.randrange(_WORDS_LEN)]
+        self._secret_chars = set(self.secret_word)
+        self._secret_counts = Counter(self.secret_word)
         self.attempts = []
         self.remaining = MAX_ATTEMPTS
         self.hints_used = 0
         self.start_time = datetime.now()
         self.correct_positions = [False]*5
         self.hinted_letters = set()
+        self.view: Optional["GameView"] = None
+        self._hint_display_cache: Optional[str] = None
     
     def get_duration(self):
         return (datetime.now() - self.start_time).total_seconds()
     
     def check_guess(self, guess: str) -> List[str]:
         self.correct_positions = [False]*5
-        result = []
+        result = ["⬛"]*5
+        # Erst Treffer markieren, dann Gelb nur so oft vergeben wie der Buchstabe noch übrig ist
+        remaining = self._secret_counts.copy()
         for i, (g, s) in enumerate(zip(guess, self.secret_word)):
             if g == s:
-                result.append("🟩")
+                result[i] = "🟩"
                 self.correct_positions[i] = True
-            elif g in self.secret_word:
-                result.append("🟨")
-            else:
-                result.append("⬛")
+                remaining[g] -= 1
+        for i, g in enumerate(guess):
+            if not self.correct_positions[i] and g in self._secret_chars and remaining[g] > 0:
+                result[i] = "🟨"
+                remaining[g] -= 1
         self.attempts.append((guess, result.copy()))
         self.remaining -= 1
+        self._hint_display_cache = None
         return result
     
     def add_hint(self):
@@ -133,18 +466,19 @@ class WordleGame:
             pos = random.choice(hidden_positions)
             self.hinted_letters.add(self.secret_word[pos])
             self.hints_used += 1
+            self._hint_display_cache = None
             return True
         return False
     
     @property
     def hint_display(self):
-        display = []
-        for i, char in enumerate(self.secret_word):
-            if self.correct_positions[i] or char in self.hinted_letters:
-                display.append(char.upper())
-            else:
-                display.append("▢")
-        return " ".join(display)
+        # Nur nach einem Versuch oder Tipp neu aufbauen
+        if self._hint_display_cache is None:
+            self._hint_display_cache = " ".join(
+                char.upper() if self.correct_positions[i] or char in self.hinted_letters else "▢"
+                for i, char in enumerate(self.secret_word)
+            )
+        return self._hint_display_cache
 
 class DateFilterModal(Modal, title="Historie filtern"):
     start_date = TextInput(
@@ -174,6 +508,7 @@ class DateFilterModal(Modal, title="Historie filtern"):
             await interaction.response.send_message("❌ Ungültiges Datumsformat! Verwende TT.MM.JJJJ", ephemeral=True)
             return
 
+        await self.cog.history.load_user_async(self.user_id)
         view = HistoryView(self.cog, self.user_id, date_filter=(start, end))
         await interaction.response.edit_message(embed=view.create_history_embed(), view=view)
 
@@ -184,34 +519,36 @@ class HistoryView(View):
         self.user_id = user_id
         self.page = page
         self.date_filter = date_filter
+        # Filter ändert sich nur über DateFilterModal, das eine neue View erzeugt
+        self._filtered = self._compute_filtered()
+        self.total_pages = max(len(self._filtered), 1)
         self.update_buttons()
     
     def get_filtered_games(self):
+        return self._filtered
+    
+    def _compute_filtered(self):
         games = self.cog.history.get_user_games(self.user_id)
         if not self.date_filter:
             return games
             
         start, end = self.date_filter
-        filtered = []
-        for g in games:
-            game_date = datetime.fromisoformat(g["timestamp"])
-            if (not start or game_date >= start) and (not end or game_date <= end):
-                filtered.append(g)
-        return filtered
+        start_ts = start.timestamp() if start else float("-inf")
+        end_ts = end.timestamp() if end else float("inf")
+        return [g for g in games if start_ts <= game_ts(g) <= end_ts]
     
     def create_history_embed(self) -> discord.Embed:
         user_games = self.get_filtered_games()
-        total_pages = max(len(user_games), 1)
         
         embed = discord.Embed(
-            title=f"📜 Spielhistorie - Seite {self.page + 1}/{total_pages}",
+            title=f"📜 Spielhistorie - Seite {self.page + 1}/{self.total_pages}",
             color=discord.Color.blue()
         )
         
         if user_games and self.page < len(user_games):
             game = user_games[self.page]
             status = "✅ Gewonnen" if game["won"] else "❌ Verloren"
-            date = datetime.fromisoformat(game["timestamp"]).strftime("%d.%m.%Y %H:%M")
+            date = datetime.fromtimestamp(game_ts(game)).strftime("%d.%m.%Y %H:%M")
             duration = self.cog.format_duration(game["duration"])
             
             embed.description = f"**{status}** • {date} • {duration}"
@@ -232,12 +569,10 @@ class HistoryView(View):
         return embed
     
     def update_buttons(self):
-        user_games = self.get_filtered_games()
-        total_pages = max(len(user_games), 1)
         self.first_page.disabled = self.page <= 0
         self.prev_page.disabled = self.page <= 0
-        self.next_page.disabled = self.page >= total_pages - 1
-        self.last_page.disabled = self.page >= total_pages - 1
+        self.next_page.disabled = self.page >= self.total_pages - 1
+        self.last_page.disabled = self.page >= self.total_pages - 1
     
     @ui.button(emoji="⏮️", style=discord.ButtonStyle.gray)
     async def first_page(self, interaction: discord.Interaction, button: Button):
@@ -275,25 +610,26 @@ class EnhancedLeaderboardView(View):
         self.leaderboard_data = []
         self.recent_games = []
         self.select_menu = None
+        self._name_cache: Dict[int, str] = {}
         self.initialize_data()
         self.create_components()
     
     def initialize_data(self):
+        self._version = self.cog.history.version
         self.leaderboard_data = self.cog.history.get_leaderboard()[:10]
+        self.recent_games = list(islice(self.cog.history.recent_games_deque, 10))
         
-        all_games = []
-        for user_id_str, games in self.cog.history.data["users"].items():
-            user_id = int(user_id_str)
-            for game in games:
-                game_copy = game.copy()
-                game_copy["user_id"] = user_id
-                all_games.append(game_copy)
-        
-        self.recent_games = sorted(
-            all_games,
-            key=lambda x: x["timestamp"],
-            reverse=True
-        )[:10]
+        # Namen einmal auflösen und für alle Sortierungen wiederverwenden
+        user_ids = {e["user_id"] for e in self.leaderboard_data}
+        user_ids.update(g["user_id"] for g in self.recent_games)
+        aggregates = self.cog.history.aggregates
+        self._name_cache = {}
+        for uid in user_ids:
+            user = self.cog.bot.get_user(uid)
+            if user:
+                self._name_cache[uid] = user.display_name
+            else:
+                self._name_cache[uid] = aggregates.get(str(uid), {}).get("name") or f"Unbekannt ({uid})"
     
     def create_components(self):
         self.clear_items()
@@ -316,8 +652,7 @@ class EnhancedLeaderboardView(View):
         if self.leaderboard_data:
             options = []
             for entry in self.leaderboard_data:
-                user = self.cog.bot.get_user(entry["user_id"])
-                label = user.display_name if user else f"Unbekannt ({entry['user_id']})"
+                label = self._name_cache[entry["user_id"]]
                 options.append(discord.SelectOption(label=label, value=str(entry["user_id"])))
             
             self.select_menu = Select(
@@ -327,14 +662,28 @@ class EnhancedLeaderboardView(View):
             self.select_menu.callback = self.select_player
             self.add_item(self.select_menu)
     
+    def cached_embed(self, key: str, build) -> discord.Embed:
+        # Ansichten mit veralteten Daten bauen neu, ohne den gemeinsamen Cache zu füllen
+        cog = self.cog
+        if self._version != cog.history.version:
+            return build()
+        if cog._embed_cache_version != self._version:
+            cog._embed_cache.clear()
+            cog._embed_cache_version = self._version
+        embed = cog._embed_cache.get(key)
+        if embed is None:
+            embed = cog._embed_cache[key] = build()
+        return embed
+    
     async def sort_leaderboard(self, interaction: discord.Interaction, mode: str):
         self.mode = "leaderboard"
-        embed = self.create_leaderboard_embed(mode)
+        embed = self.cached_embed(f"leaderboard:{mode}", lambda: self.create_leaderboard_embed(mode))
         await interaction.response.edit_message(embed=embed, view=self)
     
     async def show_recent_games(self, interaction: discord.Interaction):
         self.mode = "recent"
-        await interaction.response.edit_message(embed=self.create_recent_embed(), view=self)
+        embed = self.cached_embed("recent", self.create_recent_embed)
+        await interaction.response.edit_message(embed=embed, view=self)
     
     def create_leaderboard_embed(self, sort_mode="wins"):
         sorted_data = sorted(
@@ -348,8 +697,7 @@ class EnhancedLeaderboardView(View):
         )
         
         for idx, entry in enumerate(sorted_data, 1):
-            user = self.cog.bot.get_user(entry["user_id"])
-            name = user.display_name if user else f"Unbekannt ({entry['user_id']})"
+            name = self._name_cache[entry["user_id"]]
             
             embed.add_field(
                 name=f"{idx}. {name}",
@@ -372,10 +720,9 @@ class EnhancedLeaderboardView(View):
         )
         
         for game in self.recent_games:
-            user = self.cog.bot.get_user(game["user_id"])
-            name = user.display_name if user else f"Unbekannt ({game['user_id']})"
+            name = self._name_cache[game["user_id"]]
             status = "✅ Gewonnen" if game["won"] else "❌ Verloren"
-            date = datetime.fromisoformat(game["timestamp"]).strftime("%d.%m.%Y %H:%M")
+            date = datetime.fromtimestamp(game_ts(game)).strftime("%d.%m.%Y %H:%M")
             embed.add_field(
                 name=f"{name} - {date}",
                 value=f"{status} | Wort: ||{game['word'].upper()}|| | Versuche: {len(game['guesses'])}/{MAX_ATTEMPTS}",
@@ -386,6 +733,7 @@ class EnhancedLeaderboardView(View):
     
     async def select_player(self, interaction: discord.Interaction):
         selected_id = int(self.select_menu.values[0])
+        await self.cog.history.load_user_async(selected_id)
         view = HistoryView(self.cog, selected_id)
         await interaction.response.edit_message(embed=view.create_history_embed(), view=view)
 
@@ -423,39 +771,37 @@ class GameView(View):
         super().__init__(timeout=300)
         self.cog = cog
         self.user_id = user_id
-        self.update_buttons()
-    
-    def update_buttons(self):
-        game = self.cog.games.get(self.user_id)
-        hint_count = game.hints_used if game else 0
         
-        self.clear_items()
-        
-        guess_btn = Button(
+        self.guess_btn = Button(
             style=discord.ButtonStyle.primary,
             label="Raten ✏️",
             custom_id=f"guess_{self.user_id}"
         )
-        guess_btn.callback = self.guess_callback
+        self.guess_btn.callback = self.guess_callback
         
-        hint_btn = Button(
+        self.hint_btn = Button(
             style=discord.ButtonStyle.secondary,
-            label=f"Tipp 💡 ({hint_count}x)",
-            custom_id=f"hint_{self.user_id}",
-            disabled=hint_count >= MAX_HINTS
+            custom_id=f"hint_{self.user_id}"
         )
-        hint_btn.callback = self.hint_callback
+        self.hint_btn.callback = self.hint_callback
         
-        quit_btn = Button(
+        self.quit_btn = Button(
             style=discord.ButtonStyle.danger,
             label="Beenden 🗑️",
             custom_id=f"quit_{self.user_id}"
         )
-        quit_btn.callback = self.quit_callback
+        self.quit_btn.callback = self.quit_callback
         
-        self.add_item(guess_btn)
-        self.add_item(hint_btn)
-        self.add_item(quit_btn)
+        self.add_item(self.guess_btn)
+        self.add_item(self.hint_btn)
+        self.add_item(self.quit_btn)
+        self.update_buttons()
+    
+    def update_buttons(self):
+        game = self.cog.games.get(self.user_id)
+        hint_count = game.hints_used if game else 0
+        self.hint_btn.label = f"Tipp 💡 ({hint_count}x)"
+        self.hint_btn.disabled = hint_count >= MAX_HINTS
     
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user.id != self.user_id:
@@ -490,6 +836,91 @@ class GuessModal(Modal, title="Wordle-Ratespiel"):
     async def on_submit(self, interaction: discord.Interaction):
         await self.cog.handle_process_guess(interaction, self.guess.value.lower())
 
+def build_help_embed() -> discord.Embed:
+    embed = discord.Embed(
+        title="❓ Wordle-Hilfe",
+        description="🌟 **Willkommen beim Wordle-Bot!** 🌟",
+        color=discord.Color.blue()
+    )
+    
+    embed.add_field(
+        name="🎮 **Spielregeln**",
+        value="• Errate das 5-Buchstaben-Wort in 6 Versuchen\n"
+              "• Farben zeigen an, wie nah dein Versuch war:\n"
+              "  🟩 = Richtiger Buchstabe an richtiger Position\n"
+              "  🟨 = Buchstabe im Wort, aber falsche Position\n"
+              "  ⬛ = Buchstabe nicht im Wort\n"
+              "• Nutze 💡 Tipps um Buchstaben aufzudecken (max. 3x)",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="📊 **Statistiken**",
+        value="• Zeigt deine persönlichen Erfolge an\n"
+              "• Gewinnrate, durchschnittliche Versuche\n"
+              "• Aktuelle Gewinnserie und Spielzeit",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="📜 **Historie**",
+        value="• Zeigt alle deine bisherigen Spiele\n"
+              "• Filterfunktion nach Datum verfügbar\n"
+              "• Detailansicht für jeden Versuch",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🏆 **Rangliste**",
+        value="• Vergleiche dich mit anderen Spielern\n"
+              "• Verschiedene Sortieroptionen verfügbar\n"
+              "• Zeigt die letzten Spiele aller Spieler",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="⚙️ **Tipps & Tricks**",
+        value="• Beginne mit Wörtern mit vielen Vokalen\n"
+              "• Nutze Tipps strategisch bei schwierigen Wörtern\n"
+              "• Beobachte die Farbsymbole für Muster",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔧 **Befehle**",
+        value="• `/wordle` - Starte ein neues Spiel\n"
+              "• Klicke die Buttons im Hauptmenü\n"
+              "• Admins: `/wordle_setup` zum Einrichten",
+        inline=False
+    )
+    
+    return embed
+
+# Statische Embeds werden einmal gebaut und bei jedem Senden wiederverwendet
+HELP_EMBED = build_help_embed()
+
+MENU_EMBED_SETUP = discord.Embed(
+    title="🎮 Wordle-Hauptmenü",
+    description=(
+        "🌟 **Wordle-Spielmenü** 🌟\n\n"
+        "Teste dein Vokabular und errate das geheime Wort!\n"
+        "Klicke auf die Buttons unten um zu spielen oder "
+        "deine Statistiken einzusehen."
+    ),
+    color=discord.Color.blue()
+)
+MENU_EMBED_SETUP.set_thumbnail(url="https://i.imgur.com/7kFU4b3.png")
+
+MENU_EMBED_READY = discord.Embed(
+    title="🎮 Wordle-Hauptmenü",
+    description=(
+        "🌟 **Willkommen beim Wordle-Spiel!** 🌟\n\n"
+        "Klicke auf 'Neues Spiel 🎮' um zu starten!\n"
+        "Verwende die Buttons unten zur Navigation."
+    ),
+    color=discord.Color.blue()
+)
+
 class WordleCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -497,10 +928,86 @@ class WordleCog(commands.Cog):
         self.history = GameHistory()
         self.config = ServerConfig()
         self.persistent_views_added = False
+        self.main_menu: Optional[MainMenu] = None
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+        self._dirty_since: Optional[float] = None
+        self._pending_deletes: List[tuple] = []
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._embed_cache: Dict[str, discord.Embed] = {}
+        self._embed_cache_version = -1
+    
+    def _mark_dirty(self):
+        # Speichern verzögern, damit mehrere Änderungen in einem Schreibvorgang landen
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._save_handle:
+            self._save_handle.cancel()
+        delay = min(SAVE_DELAY, max(0.0, self._dirty_since + SAVE_MAX_DELAY - now))
+        self._save_handle = loop.call_later(delay, self._start_flush)
+    
+    def _start_flush(self):
+        self._save_task = asyncio.create_task(self._flush())
+        self._save_task.add_done_callback(self._flush_done)
+    
+    @staticmethod
+    def _flush_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            log.error("Speichern fehlgeschlagen", exc_info=task.exception())
+    
+    async def _flush(self):
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        # Nacheinander speichern, sonst schreiben zwei Flushes dieselbe .tmp-Datei
+        async with self._save_lock:
+            if self._dirty_since is None:
+                return
+            self._dirty_since = None
+            results = await asyncio.gather(
+                self.history.save_data_async(), self.config.save_config_async(),
+                return_exceptions=True
+            )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Geänderte Daten sind wieder als dirty markiert, später erneut versuchen
+            self._mark_dirty()
+            raise errors[0]
+    
+    async def _delete_reaper(self):
+        # Sammelt abgelaufene Endnachrichten und löscht sie gemeinsam
+        while True:
+            await asyncio.sleep(1)
+            if not self._pending_deletes:
+                continue
+            now = time.monotonic()
+            expired = [inter for due, inter in self._pending_deletes if due <= now]
+            if not expired:
+                continue
+            self._pending_deletes = [entry for entry in self._pending_deletes if entry[0] > now]
+            await asyncio.gather(
+                *(inter.delete_original_response() for inter in expired),
+                return_exceptions=True
+            )
+    
+    async def cog_load(self):
+        await asyncio.gather(self.history.load_async(), self.config.load_async())
+        self._reaper_task = asyncio.create_task(self._delete_reaper())
+    
+    async def cog_unload(self):
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        await self._flush()
     
     async def add_persistent_views(self):
         if not self.persistent_views_added:
-            self.bot.add_view(MainMenu())
+            # Eine Instanz für alle Menünachrichten, sie hat nur feste custom_ids
+            self.main_menu = MainMenu()
+            self.bot.add_view(self.main_menu)
             self.persistent_views_added = True
     
     @app_commands.command(name="wordle", description="Starte ein neues Wordle-Spiel")
@@ -548,8 +1055,8 @@ class WordleCog(commands.Cog):
             inline=False
         )
         
-        view = GameView(self, interaction.user.id)
-        await interaction.response.send_message(embed=embed, view=view)
+        game.view = GameView(self, interaction.user.id)
+        await interaction.response.send_message(embed=embed, view=game.view)
     
     async def handle_process_guess(self, interaction: discord.Interaction, guess: str):
         try:
@@ -563,30 +1070,48 @@ class WordleCog(commands.Cog):
                 await interaction.response.send_message("❌ Ungültige Eingabe!", ephemeral=True)
                 return
             
-            result = game.check_guess(guess)
-            embed = discord.Embed(
-                title=f"Wordle - {MAX_ATTEMPTS} Versuche",
-                description=f"Verbleibende Versuche: {game.remaining}",
-                color=discord.Color.blurple()
-            )
-            
-            for idx, (attempt, res) in enumerate(game.attempts):
-                embed.add_field(
-                    name=f"Versuch {idx + 1}",
-                    value=f"**{attempt.upper()}**\n{' '.join(res)}",
-                    inline=False
-                )
+            if guess not in WORDS_SET:
+                await interaction.response.send_message("❌ Unbekanntes Wort!", ephemeral=True)
+                return
             
-            embed.add_field(name="Aktueller Hinweis", value=f"`{game.hint_display}`", inline=False)
+            result = game.check_guess(guess)
             
             if guess == game.secret_word or game.remaining == 0:
                 await self.handle_end_game(interaction, guess == game.secret_word)
+                return
+            
+            count = len(game.attempts)
+            if count > 1 and interaction.message and interaction.message.embeds:
+                # Nur den neuen Versuch einfügen, statt alle Felder neu aufzubauen
+                embed = interaction.message.embeds[0]
+                embed.description = f"Verbleibende Versuche: {game.remaining}"
+                embed.insert_field_at(
+                    count - 1,
+                    name=f"Versuch {count}",
+                    value=f"**{guess.upper()}**\n{' '.join(result)}",
+                    inline=False
+                )
+                embed.set_field_at(-1, name="Aktueller Hinweis", value=f"`{game.hint_display}`", inline=False)
             else:
-                view = GameView(self, interaction.user.id)
-                await interaction.response.edit_message(embed=embed, view=view)
+                embed = discord.Embed(
+                    title=f"Wordle - {MAX_ATTEMPTS} Versuche",
+                    description=f"Verbleibende Versuche: {game.remaining}",
+                    color=discord.Color.blurple()
+                )
+                
+                for idx, (attempt, res) in enumerate(game.attempts):
+                    embed.add_field(
+                        name=f"Versuch {idx + 1}",
+                        value=f"**{attempt.upper()}**\n{' '.join(res)}",
+                        inline=False
+                    )
+                
+                embed.add_field(name="Aktueller Hinweis", value=f"`{game.hint_display}`", inline=False)
+            
+            await interaction.response.edit_message(embed=embed, view=game.view)
         
-        except Exception as e:
-            print(f"Fehler beim Raten: {e}")
+        except Exception:
+            log.exception("Fehler beim Raten")
             await interaction.response.send_message("❌ Fehler beim Verarbeiten des Versuchs!", ephemeral=True)
 
     async def handle_give_hint(self, interaction: discord.Interaction):
@@ -608,15 +1133,16 @@ class WordleCog(commands.Cog):
                 inline=False
             )
             
-            view = GameView(self, interaction.user.id)
+            view = game.view
+            view.update_buttons()
             
             if interaction.response.is_done():
                 await interaction.edit_original_response(embed=embed, view=view)
             else:
                 await interaction.response.edit_message(embed=embed, view=view)
         
-        except Exception as e:
-            print(f"Fehler bei Tipp: {e}")
+        except Exception:
+            log.exception("Fehler bei Tipp")
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Fehler beim Verarbeiten des Tipps!", ephemeral=True)
 
@@ -629,13 +1155,15 @@ class WordleCog(commands.Cog):
             if game is None:
                 return
             
+            await self.history.load_user_async(interaction.user.id)
             self.history.add_game(interaction.user.id, {
                 "won": won,
                 "word": game.secret_word,
                 "guesses": game.attempts,
                 "hints": game.hints_used,
                 "duration": game.get_duration()
-            })
+            }, name=interaction.user.display_name)
+            self._mark_dirty()
             
             embed = discord.Embed(
                 title="🎉 Gewonnen!" if won else "💥 Verloren!",
@@ -663,21 +1191,16 @@ class WordleCog(commands.Cog):
             final_view.add_item(stats_btn)
             
             await interaction.response.edit_message(embed=embed, view=final_view)
-            
-            await asyncio.sleep(10)
-            try:
-                await interaction.delete_original_response()
-            except discord.NotFound:
-                pass
+            self._pending_deletes.append((time.monotonic() + 10, interaction))
         
-        except Exception as e:
-            print(f"Fehler beim Beenden: {e}")
+        except Exception:
+            log.exception("Fehler beim Beenden")
 
     async def handle_show_stats(self, interaction: discord.Interaction):
         try:
-            user_games = self.history.get_user_games(interaction.user.id)
-            total_games = len(user_games)
-            wins = sum(1 for g in user_games if g["won"])
+            stats = await self.history.get_user_stats_async(interaction.user.id)
+            total_games = stats["total"]
+            wins = stats["wins"]
             losses = total_games - wins
             
             embed = discord.Embed(
@@ -686,23 +1209,16 @@ class WordleCog(commands.Cog):
             )
             
             if total_games > 0:
-                total_duration = sum(g["duration"] for g in user_games)
+                total_duration = stats["sum_duration"]
                 avg_duration = total_duration / total_games
                 win_percent = (wins / total_games) * 100
                 
-                current_streak = 0
-                for game in user_games:
-                    if game["won"]:
-                        current_streak += 1
-                    else:
-                        break
-                
                 embed.description = f"**Gesamtspiele:** {total_games}\n**Gesamtspielzeit:** {self.format_duration(total_duration)}"
                 embed.add_field(name="🏆 Gewonnen", value=f"{wins} ({win_percent:.1f}%)", inline=True)
                 embed.add_field(name="💥 Verloren", value=losses, inline=True)
-                embed.add_field(name="🔥 Aktuelle Serie", value=current_streak, inline=True)
-                embed.add_field(name="🎯 Durchschn. Versuche", value=f"{sum(len(g['guesses']) for g in user_games)/total_games:.1f}", inline=True)
-                embed.add_field(name="💡 Durchschn. Tipps", value=f"{sum(g['hints'] for g in user_games)/total_games:.1f}", inline=True)
+                embed.add_field(name="🔥 Aktuelle Serie", value=stats["current_streak"], inline=True)
+                embed.add_field(name="🎯 Durchschn. Versuche", value=f"{stats['sum_attempts']/total_games:.1f}", inline=True)
+                embed.add_field(name="💡 Durchschn. Tipps", value=f"{stats['sum_hints']/total_games:.1f}", inline=True)
                 embed.add_field(name="⏱️ Durchschn. Dauer", value=self.format_duration(avg_duration), inline=True)
             else:
                 embed.description = "📭 Keine Spiele gespielt!"
@@ -714,8 +1230,8 @@ class WordleCog(commands.Cog):
             
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
         
-        except Exception as e:
-            print(f"Fehler in Statistiken: {e}")
+        except Exception:
+            log.exception("Fehler in Statistiken")
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Fehler beim Laden der Statistiken!", ephemeral=True)
             else:
@@ -723,10 +1239,11 @@ class WordleCog(commands.Cog):
 
     async def handle_show_history(self, interaction: discord.Interaction):
         try:
+            await self.history.load_user_async(interaction.user.id)
             view = HistoryView(self, interaction.user.id)
             await interaction.response.send_message(embed=view.create_history_embed(), view=view, ephemeral=True)
-        except Exception as e:
-            print(f"Fehler in Historie: {e}")
+        except Exception:
+            log.exception("Fehler in Historie")
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Fehler beim Laden der Historie!", ephemeral=True)
             else:
@@ -736,137 +1253,128 @@ class WordleCog(commands.Cog):
         try:
             view = EnhancedLeaderboardView(self)
             await interaction.response.send_message(
-                embed=view.create_leaderboard_embed(),
+                embed=view.cached_embed("leaderboard:wins", view.create_leaderboard_embed),
                 view=view,
                 ephemeral=True
             )
-        except Exception as e:
-            print(f"Fehler in Rangliste: {e}")
+        except Exception:
+            log.exception("Fehler in Rangliste")
             if not interaction.response.is_done():
                 await interaction.response.send_message("❌ Fehler beim Laden der Rangliste!", ephemeral=True)
             else:
                 await interaction.followup.send("❌ Fehler beim Laden der Rangliste!", ephemeral=True)
 
     async def handle_show_help(self, interaction: discord.Interaction):
-        embed = discord.Embed(
-            title="❓ Wordle-Hilfe",
-            description="🌟 **Willkommen beim Wordle-Bot!** 🌟",
-            color=discord.Color.blue()
-        )
-        
-        embed.add_field(
-            name="🎮 **Spielregeln**",
-            value="• Errate das 5-Buchstaben-Wort in 6 Versuchen\n"
-                  "• Farben zeigen an, wie nah dein Versuch war:\n"
-                  "  🟩 = Richtiger Buchstabe an richtiger Position\n"
-                  "  🟨 = Buchstabe im Wort, aber falsche Position\n"
-                  "  ⬛ = Buchstabe nicht im Wort\n"
-                  "• Nutze 💡 Tipps um Buchstaben aufzudecken (max. 3x)",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="📊 **Statistiken**",
-            value="• Zeigt deine persönlichen Erfolge an\n"
-                  "• Gewinnrate, durchschnittliche Versuche\n"
-                  "• Aktuelle Gewinnserie und Spielzeit",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="📜 **Historie**",
-            value="• Zeigt alle deine bisherigen Spiele\n"
-                  "• Filterfunktion nach Datum verfügbar\n"
-                  "• Detailansicht für jeden Versuch",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🏆 **Rangliste**",
-            value="• Vergleiche dich mit anderen Spielern\n"
-                  "• Verschiedene Sortieroptionen verfügbar\n"
-                  "• Zeigt die letzten Spiele aller Spieler",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="⚙️ **Tipps & Tricks**",
-            value="• Beginne mit Wörtern mit vielen Vokalen\n"
-                  "• Nutze Tipps strategisch bei schwierigen Wörtern\n"
-                  "• Beobachte die Farbsymbole für Muster",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🔧 **Befehle**",
-            value="• `/wordle` - Starte ein neues Spiel\n"
-                  "• Klicke die Buttons im Hauptmenü\n"
-                  "• Admins: `/wordle_setup` zum Einrichten",
-            inline=False
-        )
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await interaction.response.send_message(embed=HELP_EMBED, ephemeral=True)
 
     async def handle_setup(self, interaction: discord.Interaction):
         try:
-            self.config.set_wordle_channel(interaction.guild_id, interaction.channel_id)
+            # Sofort bestätigen, danach Löschen und Senden parallel ausführen
+            await interaction.response.defer(ephemeral=True)
             
-            main_embed = discord.Embed(
-                title="🎮 Wordle-Hauptmenü",
-                description=(
-                    "🌟 **Wordle-Spielmenü** 🌟\n\n"
-                    "Teste dein Vokabular und errate das geheime Wort!\n"
-                    "Klicke auf die Buttons unten um zu spielen oder "
-                    "deine Statistiken einzusehen."
-                ),
-                color=discord.Color.blue()
+            # Altes Menü gezielt löschen, es kann auch in einem anderen Channel liegen
+            old_channel_id = self.config.get_wordle_channel(interaction.guild_id)
+            old_message_id = self.config.get_menu_message(interaction.guild_id)
+            if old_channel_id and old_message_id:
+                delete = self.bot.get_partial_messageable(old_channel_id).get_partial_message(old_message_id).delete()
+            else:
+                delete = asyncio.sleep(0)
+            
+            _, message = await asyncio.gather(
+                delete,
+                interaction.channel.send(embed=MENU_EMBED_SETUP, view=self.main_menu),
+                return_exceptions=True
             )
-            main_embed.set_thumbnail(url="https://i.imgur.com/7kFU4b3.png")
+            if isinstance(message, BaseException):
+                raise message
             
-            try:
-                await interaction.channel.purge(limit=1)
-            except:
-                pass
-                
-            await interaction.channel.send(embed=main_embed, view=MainMenu())
-            await interaction.response.send_message("✅ Channel erfolgreich eingerichtet!", ephemeral=True)
+            self.config.set_wordle_channel(interaction.guild_id, interaction.channel_id)
+            self.config.set_menu_message(interaction.guild_id, message.id)
+            self._mark_dirty()
+            await interaction.followup.send("✅ Channel erfolgreich eingerichtet!", ephemeral=True)
         
-        except Exception as e:
-            print(f"Fehler im Setup: {e}")
-            await interaction.response.send_message("❌ Fehler beim Einrichten des Channels!", ephemeral=True)
+        except Exception:
+            log.exception("Fehler im Setup")
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ Fehler beim Einrichten des Channels!", ephemeral=True)
+            else:
+                await interaction.followup.send("❌ Fehler beim Einrichten des Channels!", ephemeral=True)
     
     def format_duration(self, seconds: float) -> str:
-        minutes, seconds = divmod(seconds, 60)
-        return f"{int(minutes)}m {int(seconds)}s"
+        return _format_minutes(*divmod(int(seconds), 60))
+
+async def refresh_menu(guild: discord.Guild, channel_id: int, cog: WordleCog, semaphore: asyncio.Semaphore):
+    channel = guild.get_channel(channel_id)
+    if not channel:
+        return
+    message_id = cog.config.get_menu_message(guild.id)
+    # Steht das Menü noch als letzte Nachricht im Channel, bleibt es einfach stehen
+    if message_id and channel.last_message_id == message_id:
+        return
+    async with semaphore:
+        # Zeitlimit erst nach dem Warten auf den Semaphor, es gilt nur für die REST-Aufrufe
+        try:
+            await asyncio.wait_for(post_menu(guild, channel, message_id, cog), timeout=10)
+        except asyncio.TimeoutError:
+            log.warning("Menü in %s nach 10s abgebrochen", guild.id)
+        except discord.HTTPException as e:
+            log.debug("Menü in %s übersprungen: %s", guild.id, e)
+
+async def post_menu(guild: discord.Guild, channel, message_id: Optional[int], cog: WordleCog):
+    if not message_id:
+        last = None
+        async for last in channel.history(limit=1):
+            pass
+        if last and last.author.id == bot.user.id and last.embeds and last.embeds[0].title == MENU_EMBED_READY.title:
+            cog.config.set_menu_message(guild.id, last.id)
+            cog._mark_dirty()
+            return
+    else:
+        try:
+            await channel.get_partial_message(message_id).delete()
+        except discord.NotFound:
+            pass
+    message = await channel.send(embed=MENU_EMBED_READY, view=cog.main_menu)
+    cog.config.set_menu_message(guild.id, message.id)
+    cog._mark_dirty()
+
+async def sync_commands(cog: WordleCog):
+    if DEV_GUILD_ID:
+        # Server-Sync greift sofort und belastet nicht das globale Limit
+        guild = discord.Object(id=int(DEV_GUILD_ID))
+        bot.tree.copy_global_to(guild=guild)
+        await bot.tree.sync(guild=guild)
+        return
+    
+    # Global nur synchronisieren, wenn sich die Befehle seit dem letzten Start geändert haben
+    payload = json.dumps([c.to_dict(bot.tree) for c in bot.tree.get_commands()], sort_keys=True)
+    tree_hash = hashlib.blake2b(payload.encode()).hexdigest()
+    if tree_hash != cog.config.get_tree_hash():
+        await bot.tree.sync()
+        cog.config.set_tree_hash(tree_hash)
+        cog._mark_dirty()
+
+_startup_done = False
 
 @bot.event
 async def on_ready():
-    await bot.add_cog(WordleCog(bot))
-    cog = bot.get_cog("WordleCog")
-    await cog.add_persistent_views()
+    # on_ready kommt nach jedem Reconnect erneut, die Einrichtung soll nur einmal laufen
+    global _startup_done
+    if _startup_done:
+        return
+    _startup_done = True
     
-    await bot.tree.sync()
+    cog = bot.get_cog("WordleCog")
     
-    for guild in bot.guilds:
-        if channel_id := cog.config.get_wordle_channel(guild.id):
-            channel = guild.get_channel(channel_id)
-            if channel:
-                try:
-                    await channel.purge(limit=1)
-                    main_embed = discord.Embed(
-                        title="🎮 Wordle-Hauptmenü",
-                        description=(
-                            "🌟 **Willkommen beim Wordle-Spiel!** 🌟\n\n"
-                            "Klicke auf 'Neues Spiel 🎮' um zu starten!\n"
-                            "Verwende die Buttons unten zur Navigation."
-                        ),
-                        color=discord.Color.blue()
-                    )
-                    await channel.send(embed=main_embed, view=MainMenu())
-                except:
-                    pass
+    # Menüs aller Server gleichzeitig erneuern, begrenzt um das Rate-Limit zu schonen
+    semaphore = asyncio.Semaphore(10)
+    tasks = []
+    for guild_id, channel_id in cog.config.get_all_wordle_channels().items():
+        if guild := bot.get_guild(guild_id):
+            tasks.append(refresh_menu(guild, channel_id, cog, semaphore))
+    await asyncio.gather(*tasks, return_exceptions=True)
     
-    print(f"{bot.user} ist bereit!")
+    log.info("%s ist bereit!", bot.user)
 
 if __name__ == "__main__":
     if not os.path.exists(WORDS_FILE):
@@ -874,10 +1382,11 @@ if __name__ == "__main__":
             f.write("apfel\nbirne\nbanane\nmango\nbeere\n")
         print(f"Beispiel-Wörterdatei {WORDS_FILE} erstellt!")
     
-    with open(WORDS_FILE) as f:
-        WORDS = [word.strip().lower() for word in f.readlines() if len(word.strip()) == 5]
+    WORDS = load_words(WORDS_FILE)
+    _WORDS_LEN = len(WORDS)
+    WORDS_SET = frozenset(WORDS)
     
     if not WORDS:
         raise ValueError("Keine gültigen Wörter in der Datei!")
     
-    bot.run(TOKEN)
+    bot.run(TOKEN, root_logger=True)